@@ -0,0 +1,183 @@
+"""
+대안 경로 찾기 (Yen의 k-최단 무순환 경로)
+건설현장이 새로 생기기 전에 MyHome에서 BandalgomCoffee까지 갈 수 있는 k개의 최단 대안 경로를 구합니다.
+목적지에서 한 번 구한 거리장을 모든 spur 탐색의 A* 휴리스틱으로 재사용하므로
+k개의 대안을 구하는 비용이 BFS k번이 아니라 질의 한 번의 작은 배수에 그칩니다.
+"""
+
+import heapq
+import sys
+
+import pandas as pd
+
+from map_direct_save import (
+    DIRECTIONS,
+    DistanceFieldCache,
+    create_grid_map,
+    find_start_and_end_points,
+    load_processed_data,
+    path_from_distance_field,
+)
+
+
+def astar_spur_path(grid_map, start, end, heuristic, blocked_nodes, blocked_edges):
+    """
+    목적지 거리장을 휴리스틱으로 사용하는 A* 탐색 함수
+    원래 지도의 정확한 거리이므로 칸/간선을 막은 지도에서도 과대평가하지 않습니다.
+
+    Args:
+        grid_map (dict): 격자 지도
+        start (tuple): spur 노드 좌표
+        end (tuple): 목적지 좌표
+        heuristic (dict): 목적지에서 구한 거리장
+        blocked_nodes (set): 지나갈 수 없는 좌표
+        blocked_edges (set): 지나갈 수 없는 (출발, 도착) 간선
+
+    Returns:
+        list: start에서 end까지의 최단경로 좌표 리스트 (없으면 빈 리스트)
+    """
+    if start not in heuristic:
+        return []
+
+    # (g + h, -g, 좌표) 순으로 꺼내서 같은 f값이면 목적지에 더 가까운 칸을 먼저 확장
+    heap = [(heuristic[start], 0, start)]
+    parents = {start: None}
+    best = {start: 0}
+
+    while heap:
+        _, negative_g, current = heapq.heappop(heap)
+        g = -negative_g
+        if g > best[current]:
+            continue
+
+        if current == end:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            return path[::-1]
+
+        for dx, dy in DIRECTIONS:
+            next_pos = (current[0] + dx, current[1] + dy)
+
+            # 원래 지도에서 목적지에 닿지 않는 칸, 막힌 칸과 간선은 무시
+            if (next_pos not in heuristic or next_pos in blocked_nodes
+                    or (current, next_pos) in blocked_edges):
+                continue
+
+            if g + 1 < best.get(next_pos, float('inf')):
+                best[next_pos] = g + 1
+                parents[next_pos] = current
+                heapq.heappush(heap, (g + 1 + heuristic[next_pos], -(g + 1), next_pos))
+
+    return []
+
+
+def k_shortest_paths(grid_map, start, end, k, field_cache=None):
+    """
+    Yen 알고리즘으로 start에서 end까지의 k개 최단 무순환 경로를 찾는 함수
+
+    Args:
+        grid_map (dict): 격자 지도
+        start (tuple): 시작점 좌표
+        end (tuple): 끝점 좌표
+        k (int): 찾을 경로 개수
+        field_cache (DistanceFieldCache): 목적지 거리장을 재사용할 캐시 (없으면 새로 생성)
+
+    Returns:
+        list: 길이 순으로 정렬된 경로 좌표 리스트들 (경로가 k개보다 적으면 있는 만큼)
+    """
+    if field_cache is None:
+        field_cache = DistanceFieldCache(grid_map)
+
+    # 목적지 거리장 하나로 첫 경로와 모든 spur 탐색의 휴리스틱을 해결
+    heuristic = field_cache.get(end)
+    first_path = path_from_distance_field(heuristic, start)
+    if not first_path or k <= 0:
+        return []
+
+    paths = [first_path]
+    found = {tuple(first_path)}
+    candidates = []
+
+    while len(paths) < k:
+        previous = paths[-1]
+
+        for i in range(len(previous) - 1):
+            spur_node = previous[i]
+            root = previous[:i + 1]
+
+            # 같은 root를 공유하는 기존 경로의 다음 간선을 막아 다른 갈래를 찾음
+            blocked_edges = {
+                (path[i], path[i + 1])
+                for path in paths
+                if len(path) > i + 1 and path[:i + 1] == root
+            }
+            blocked_nodes = set(root[:-1])
+
+            spur_path = astar_spur_path(grid_map, spur_node, end, heuristic, blocked_nodes, blocked_edges)
+            if not spur_path:
+                continue
+
+            candidate = tuple(root[:-1] + spur_path)
+            if candidate not in found:
+                found.add(candidate)
+                heapq.heappush(candidates, (len(candidate), candidate))
+
+        if not candidates:
+            break
+
+        _, best_candidate = heapq.heappop(candidates)
+        paths.append(list(best_candidate))
+
+    return paths
+
+
+def save_paths_to_csv(paths, filename='home_to_cafe_alternatives.csv'):
+    """
+    대안 경로들을 하나의 CSV 파일로 저장하는 함수
+
+    Args:
+        paths (list): 경로 좌표 리스트들
+        filename (str): 저장할 파일명
+    """
+    if not paths:
+        print('저장할 경로가 없습니다.')
+        return
+
+    path_df = pd.DataFrame([
+        {'route': number, 'step': step, 'x': point[0], 'y': point[1]}
+        for number, path in enumerate(paths, start=1)
+        for step, point in enumerate(path, start=1)
+    ])
+    path_df.to_csv(filename, index=False)
+    print(f'대안 경로 {len(paths)}개가 {filename} 파일로 저장되었습니다.')
+
+
+def main():
+    """
+    메인 실행 함수 (python alternative_routes.py [k])
+    """
+    print('반달곰 커피 대안 경로 찾기')
+    print('=' * 50)
+
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    data, category_df = load_processed_data()
+    start_point, end_point = find_start_and_end_points(data, category_df)
+
+    if start_point is None or end_point is None:
+        print('시작점 또는 끝점을 찾을 수 없어서 경로 탐색을 중단합니다.')
+        return
+
+    grid_map = create_grid_map(data, start_point)
+    paths = k_shortest_paths(grid_map, start_point, end_point, k)
+
+    for number, path in enumerate(paths, start=1):
+        print(f'{number}번 경로: {len(path) - 1}칸')
+
+    save_paths_to_csv(paths)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,47 +3,199 @@
 반달곰 커피 프로젝트의 첫 번째 단계로 CSV 파일들을 불러와 분석합니다.
 """
 
+import sys
+
+import numpy as np
 import pandas as pd
 
+# 좌표 격자 크기가 행 수의 이 배수를 넘으면 조밀한 격자로 보지 않고 pandas merge 사용
+DENSE_GRID_RATIO = 4
+
+
+def merge_area_data(area_map, area_struct, sort=False):
+    """
+    지금까지 사용하던 방식대로 pandas merge(left)로 두 데이터를 병합하는 함수
+    
+    Args:
+        area_map (pandas.DataFrame): area_map.csv 데이터
+        area_struct (pandas.DataFrame): area_struct.csv 데이터
+        sort (bool): 병합 후 (x, y) 좌표 기준으로 정렬할지 여부
+        
+    Returns:
+        pandas.DataFrame: 병합된 데이터프레임
+    """
+    merged_data = area_map.merge(area_struct, on=['x', 'y'], how='left')
+    if sort:
+        merged_data = merged_data.sort_values(['x', 'y']).reset_index(drop=True)
+    return merged_data
+
+
+def dense_coordinate_join(area_map, area_struct, sort=False):
+    """
+    (x, y) 좌표를 조밀한 격자의 선형 인덱스로 바꿔 두 데이터를 병합하는 함수
+    해시 조인과 정렬 없이 O(N)으로 merge_area_data와 같은 결과를 만듭니다.
+    
+    좌표가 정수가 아니거나, 격자가 조밀하지 않거나, 좌표가 중복되거나, 컬럼명이 겹치거나,
+    값 컬럼이 numpy 정수/실수/bool/object 자료형이 아닌 경우(Int64, category 등)에는
+    merge와 똑같이 동작하도록 merge_area_data로 처리합니다.
+    
+    Args:
+        area_map (pandas.DataFrame): area_map.csv 데이터
+        area_struct (pandas.DataFrame): area_struct.csv 데이터
+        sort (bool): 병합 후 (x, y) 좌표 기준으로 정렬할지 여부
+        
+    Returns:
+        pandas.DataFrame: 병합된 데이터프레임
+    """
+    keys = ['x', 'y']
+    value_columns = [column for column in area_struct.columns if column not in keys]
+    overlapping = set(value_columns) & set(area_map.columns)
+    key_frames = [area_map[keys], area_struct[keys]]
+    
+    if (area_map.empty or area_struct.empty or overlapping
+            or not all(_is_numpy_kind(dtype, 'iu') for frame in key_frames for dtype in frame.dtypes)
+            or not all(_is_numpy_kind(area_struct[column].dtype, 'iufbO') for column in value_columns)):
+        return merge_area_data(area_map, area_struct, sort)
+    
+    map_x, map_y = area_map['x'].to_numpy(), area_map['y'].to_numpy()
+    struct_x, struct_y = area_struct['x'].to_numpy(), area_struct['y'].to_numpy()
+    x_min = min(map_x.min(), struct_x.min())
+    y_min = min(map_y.min(), struct_y.min())
+    height = max(map_y.max(), struct_y.max()) - y_min + 1
+    size = (max(map_x.max(), struct_x.max()) - x_min + 1) * height
+    
+    if size > DENSE_GRID_RATIO * (len(area_map) + len(area_struct)):
+        return merge_area_data(area_map, area_struct, sort)
+    
+    # 좌표 → 선형 인덱스 (x 우선, y 다음 순서이므로 선형 인덱스 순서가 곧 (x, y) 정렬 순서)
+    map_index = (map_x - x_min) * height + (map_y - y_min)
+    struct_index = (struct_x - x_min) * height + (struct_y - y_min)
+    
+    # 중복 좌표는 merge의 행 복제 규칙을 그대로 따르도록 merge 사용
+    if (np.bincount(map_index, minlength=size).max() > 1
+            or np.bincount(struct_index, minlength=size).max() > 1):
+        return merge_area_data(area_map, area_struct, sort)
+    
+    # area_struct 행 번호를 격자에 흩뿌림 (없는 칸은 -1)
+    struct_slot = np.full(size, -1, dtype=np.intp)
+    struct_slot[struct_index] = np.arange(len(area_struct))
+    
+    if sort:
+        # area_map 행 번호도 격자에 흩뿌린 뒤 채워진 칸만 모으면 (x, y) 순서가 됨
+        map_slot = np.full(size, -1, dtype=np.intp)
+        map_slot[map_index] = np.arange(len(area_map))
+        filled = map_slot >= 0
+        map_rows = map_slot[filled]
+        struct_rows = struct_slot[filled]
+    else:
+        map_rows = np.arange(len(area_map))
+        struct_rows = struct_slot[map_index]
+    
+    joined = area_map.take(map_rows).reset_index(drop=True)
+    missing = struct_rows < 0
+    for column in value_columns:
+        joined[column] = _gather_column(area_struct[column], struct_rows, missing)
+    
+    return joined
+
+
+def _is_numpy_kind(dtype, kinds):
+    """
+    dtype이 numpy 자료형이고 종류(kind)가 kinds 중 하나인지 확인하는 함수
+    """
+    return isinstance(dtype, np.dtype) and dtype.kind in kinds
+
+
+def _gather_column(series, rows, missing):
+    """
+    rows 위치의 값을 모으고 없는 칸은 merge처럼 NaN으로 채우는 함수
+    (실수는 자료형 유지, 정수는 float64, bool은 object로 바뀌는 merge의 자료형 변환도 같게 맞춤)
+    """
+    values = series.to_numpy()[np.where(missing, 0, rows)]
+    if not missing.any():
+        return pd.Series(values, dtype=series.dtype)
+    
+    if series.dtype.kind in 'iu':
+        values = values.astype(np.float64)
+    elif series.dtype.kind in 'bO':
+        values = values.astype(object)
+    values[missing] = np.nan
+    return pd.Series(values, dtype=values.dtype)
+
 
-def load_and_analyze_data():
+def join_area_data(area_map, area_struct, join_mode='merge', sort=False):
+    """
+    병합 방식(join_mode)에 따라 area_map과 area_struct를 병합하는 함수
+    
+    Args:
+        area_map (pandas.DataFrame): area_map.csv 데이터
+        area_struct (pandas.DataFrame): area_struct.csv 데이터
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+        sort (bool): 병합 후 (x, y) 좌표 기준으로 정렬할지 여부
+        
+    Returns:
+        pandas.DataFrame: 병합된 데이터프레임
+    """
+    if join_mode == 'dense':
+        return dense_coordinate_join(area_map, area_struct, sort)
+    if join_mode == 'merge':
+        return merge_area_data(area_map, area_struct, sort)
+    raise ValueError(f'알 수 없는 병합 방식입니다: {join_mode}')
+
+
+def read_area_csvs():
+    """
+    세 CSV 파일을 불러오는 함수 (area_category.csv의 공백은 제거)
+    
+    Returns:
+        tuple: (area_map, area_struct, area_category) 데이터프레임
+    """
+    area_map = pd.read_csv('area_map.csv')
+    area_struct = pd.read_csv('area_struct.csv')
+    area_category = pd.read_csv('area_category.csv')
+    
+    # 컬럼명과 데이터의 공백 제거
+    area_category.columns = area_category.columns.str.strip()
+    area_category['struct'] = area_category['struct'].str.strip()
+    
+    return area_map, area_struct, area_category
+
+
+def load_and_analyze_data(join_mode='merge', frames=None):
     """
     CSV 파일들을 불러와 분석하고 병합하는 함수
     
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+        frames (tuple): 이미 불러온 (area_map, area_struct, area_category) (없으면 CSV에서 읽음)
+    
     Returns:
         pandas.DataFrame: 병합된 데이터프레임
     """
     # CSV 파일들 불러오기
     print('=== 데이터 파일 불러오기 ===')
     
-    area_map = pd.read_csv('area_map.csv')
+    if frames is None:
+        frames = read_area_csvs()
+    area_map, area_struct, area_category = frames
+    
     print('area_map.csv 내용:')
     print(area_map.head())
     print(f'데이터 크기: {area_map.shape}\n')
     
-    area_struct = pd.read_csv('area_struct.csv')
     print('area_struct.csv 내용:')
     print(area_struct.head())
     print(f'데이터 크기: {area_struct.shape}\n')
     
-    area_category = pd.read_csv('area_category.csv')
-    # 컬럼명과 데이터의 공백 제거
-    area_category.columns = area_category.columns.str.strip()
-    area_category['struct'] = area_category['struct'].str.strip()
     print('area_category.csv 내용:')
     print(area_category.head())
     print(f'데이터 크기: {area_category.shape}\n')
     
     # 세 데이터를 하나의 DataFrame으로 병합
     print('=== 데이터 병합 ===')
-    merged_data = area_map.merge(
-        area_struct, 
-        on=['x', 'y'], 
-        how='left'
-    )
     
     # 좌표 기준으로 정렬
-    merged_data = merged_data.sort_values(['x', 'y']).reset_index(drop=True)
+    merged_data = join_area_data(area_map, area_struct, join_mode, sort=True)
     print('병합된 전체 데이터:')
     print(merged_data.head(10))
     print(f'전체 데이터 크기: {merged_data.shape}\n')
@@ -100,15 +252,18 @@ def generate_structure_report(data, category_df):
     print()
 
 
-def main():
+def main(join_mode='merge'):
     """
     메인 실행 함수
+    
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
     """
     print('반달곰 커피 데이터 분석 프로젝트 - 1단계')
     print('=' * 50)
     
     # 데이터 불러오기 및 분석
-    filtered_data, area_category = load_and_analyze_data()
+    filtered_data, area_category = load_and_analyze_data(join_mode)
     
     # 보너스: 구조물 종류별 요약 통계 생성
     generate_structure_report(filtered_data, area_category)
@@ -119,5 +274,6 @@ def main():
 
 
 if __name__ == '__main__':
-    result_data, category_data = main()
+    # python caffee_map.py --dense 로 실행하면 조밀 좌표 병합 사용
+    result_data, category_data = main('dense' if '--dense' in sys.argv else 'merge')
     
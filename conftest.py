@@ -0,0 +1,20 @@
+"""
+테스트 공통 fixture
+"""
+
+import os
+
+import pytest
+
+from map_direct_save import load_processed_data
+
+
+@pytest.fixture
+def repo_dir(monkeypatch):
+    # CSV 파일은 저장소 최상위 기준 상대 경로로 읽음
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def area_data(repo_dir):
+    return load_processed_data()
@@ -0,0 +1,147 @@
+"""
+등시선(isochrone) / k걸음 도달 영역 질의
+BandalgomCoffee에서 깊이 제한 BFS를 한 번만 수행해 k걸음 안에 카페에 도달할 수 있는 칸과 구조물을 구합니다.
+격자는 무향이므로 카페에서 k걸음 안에 닿는 칸이 곧 k걸음 안에 카페로 갈 수 있는 칸이며,
+탐색 비용은 지도 전체가 아니라 도달한 영역의 크기에 비례합니다.
+"""
+
+import sys
+from collections import deque
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from map_cache import MapCache
+from map_direct_save import DIRECTIONS
+
+# 래스터 위에 덧칠할 배송 구역 색상 (가까운 구역부터)
+ZONE_COLORMAP = 'YlOrRd_r'
+ZONE_ALPHA = 0.6
+
+
+def isochrone_cells(grid_map, sources, max_steps):
+    """
+    출발점들에서 max_steps걸음 이내로 도달하는 칸을 깊이 제한 BFS로 구하는 함수
+
+    Args:
+        grid_map (dict): 격자 지도
+        sources (list): 출발점(카페) 좌표 리스트
+        max_steps (int): 최대 이동 칸 수
+
+    Returns:
+        dict: {(x, y): 가장 가까운 출발점까지의 이동 칸 수} (도달한 칸만)
+    """
+    reached = {source: 0 for source in sources}
+    queue = deque(sources)
+
+    while queue:
+        current_x, current_y = queue.popleft()
+        steps = reached[(current_x, current_y)]
+
+        # 깊이 제한에 도달한 칸은 더 확장하지 않음
+        if steps >= max_steps:
+            continue
+
+        for dx, dy in DIRECTIONS:
+            next_pos = (current_x + dx, current_y + dy)
+            if next_pos in reached or grid_map.get(next_pos, 'obstacle') == 'obstacle':
+                continue
+            reached[next_pos] = steps + 1
+            queue.append(next_pos)
+
+    return reached
+
+
+def reached_structures(reached, structures, category_mapping, max_steps):
+    """
+    도달 영역 안의 구조물을 카테고리 이름별로 모으는 함수
+    장애물인 구조물(Apartment, Building)은 인접한 칸까지 도달하면 한 걸음 더 간 것으로 봅니다.
+
+    Args:
+        reached (dict): isochrone_cells 결과
+        structures (dict): {(x, y): category} 구조물 색인
+        category_mapping (dict): {category: 구조물 이름} (area_category.csv)
+        max_steps (int): 최대 이동 칸 수
+
+    Returns:
+        dict: {구조물 이름: [((x, y), 이동 칸 수), ...]} (이동 칸 수 순으로 정렬)
+    """
+    steps_by_structure = {}
+
+    # 도달한 칸과 그 이웃만 색인에서 찾으므로 비용이 도달 영역에 비례
+    for (x, y), steps in reached.items():
+        for dx, dy in [(0, 0)] + DIRECTIONS:
+            pos = (x + dx, y + dy)
+            if pos not in structures:
+                continue
+            structure_steps = reached[pos] if pos in reached else steps + 1
+            if structure_steps <= max_steps and structure_steps < steps_by_structure.get(pos, max_steps + 1):
+                steps_by_structure[pos] = structure_steps
+
+    by_category = {}
+    for pos, steps in sorted(steps_by_structure.items(), key=lambda item: (item[1], item[0])):
+        category = structures[pos]
+        name = category_mapping.get(category, f'Category_{category}')
+        by_category.setdefault(name, []).append((pos, steps))
+
+    return by_category
+
+
+def export_isochrone_raster(cache, reached, max_steps, zones=3, filename='isochrone.png'):
+    """
+    지도 래스터 위에 도달 영역을 구역별 색으로 덧칠해 저장하는 함수
+
+    Args:
+        cache (MapCache): 지도 캐시 (바탕 래스터는 캐시된 타일 재사용)
+        reached (dict): isochrone_cells 결과
+        max_steps (int): 최대 이동 칸 수
+        zones (int): 0~max_steps를 나눌 구역 수
+        filename (str): 저장할 파일명
+
+    Returns:
+        numpy.ndarray: 구역이 덧칠된 RGB 배열
+    """
+    raster = cache.render_raster().copy()
+    origin_x, origin_y = cache.raster_origin
+    colors = plt.get_cmap(ZONE_COLORMAP, zones)
+
+    for (x, y), steps in reached.items():
+        zone = min(zones - 1, steps * zones // (max_steps + 1))
+        row, col = y - origin_y, x - origin_x
+        raster[row, col] = (1 - ZONE_ALPHA) * raster[row, col] + ZONE_ALPHA * np.array(colors(zone)[:3])
+
+    plt.imsave(filename, raster)
+    print(f'도달 영역 래스터가 {filename} 파일로 저장되었습니다.')
+    return raster
+
+
+def main():
+    """
+    메인 실행 함수 (python isochrone.py [최대 이동 칸 수])
+    """
+    print('반달곰 커피 배송 가능 구역 (k걸음 도달 영역)')
+    print('=' * 50)
+
+    max_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    cache = MapCache.load()
+    cafes = [
+        pos for pos, category in cache.structures.items()
+        if cache.category_mapping.get(category) == 'BandalgomCoffee'
+    ]
+    if not cafes:
+        print('경고: BandalgomCoffee를 찾을 수 없습니다.')
+        return
+
+    reached = isochrone_cells(cache.grid_map, cafes, max_steps)
+    print(f'{max_steps}걸음 안에 카페에 도달하는 칸: {len(reached)}개')
+
+    structures = reached_structures(reached, cache.structures, cache.category_mapping, max_steps)
+    for name, items in structures.items():
+        print(f'{name}: {[(pos, steps) for pos, steps in items]}')
+
+    export_isochrone_raster(cache, reached, max_steps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""
+지도 캐시와 변경분(delta) 반영
+area_map.csv / area_struct.csv를 한 번만 불러와 병합 스냅샷, 격자 지도, 구조물 색인을 메모리에 유지하고,
+바뀐 칸만 담은 작은 delta 파일을 받아 그 칸만 고칩니다.
+파생 캐시(거리장, 렌더링 타일)는 delta가 닿는 영역에 걸친 것만 무효화하고 새 칸은 버퍼에 모아 두므로
+자주 들어오는 작은 갱신의 비용이 지도 전체가 아니라 delta 크기에 비례합니다.
+python map_cache.py <delta.csv>는 delta를 반영한 스냅샷을 원본 CSV에 다시 저장해 다음 실행의 모든 단계가 읽게 합니다.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgb
+
+from map_direct_save import (
+    DIRECTIONS,
+    DistanceFieldCache,
+    cell_state,
+    create_grid_map,
+    load_processed_data,
+)
+
+# 렌더링 타일 한 변의 칸 수
+TILE_SIZE = 8
+
+# 타일 렌더링 색상 (map_draw.py의 구조물 색상과 동일)
+CELL_COLORS = {
+    'Apartment': 'brown',
+    'Building': 'brown',
+    'MyHome': 'green',
+    'BandalgomCoffee': 'green',
+    'ConstructionSite': 'gray',
+    'free': 'white',
+    'empty': 'lightgray'
+}
+
+# delta 파일에서 반영하는 값 컬럼 (area는 새 칸이면 반드시 있어야 함)
+DELTA_COLUMNS = ['ConstructionSite', 'category', 'area']
+
+# delta에 값이 없을 때 새 칸에 채우는 기본값
+NEW_CELL_DEFAULTS = {'ConstructionSite': 0, 'category': 0}
+
+# 스냅샷을 저장할 원본 CSV 파일과 컬럼
+SNAPSHOT_FILES = {
+    'area_map.csv': ['x', 'y', 'ConstructionSite'],
+    'area_struct.csv': ['x', 'y', 'category', 'area']
+}
+
+
+class MapCache:
+    """
+    병합 스냅샷, 격자 지도, 구조물 색인과 파생 캐시를 함께 보관하는 지도 캐시
+    """
+
+    def __init__(self, data, category_df):
+        self._data = data
+        self.category_df = category_df
+        self.category_mapping = category_df.set_index('category')['struct'].to_dict()
+
+        # 좌표 → 스냅샷 행 라벨 (칸 단위 수정을 O(1)로 하기 위한 색인)
+        self.row_index = {
+            (int(x), int(y)): label
+            for label, x, y in zip(data.index, data['x'], data['y'])
+        }
+        self.grid_map = create_grid_map(data)
+
+        # 아직 스냅샷에 붙이지 않은 새 칸: {행 라벨: 행 dict} (data를 읽을 때 한 번에 붙임)
+        self.pending_rows = {}
+        self.next_label = int(data.index.max()) + 1 if len(data) else 0
+
+        # 구조물 색인: {(x, y): category} (category가 0이 아닌 칸만)
+        self.structures = {
+            (int(x), int(y)): int(category)
+            for x, y, category in zip(data['x'], data['y'], data['category'])
+            if pd.notna(category) and category != 0
+        }
+
+        # 파생 캐시
+        self.field_cache = DistanceFieldCache(self.grid_map)
+        self.tiles = {}
+        self.origin = (int(data['x'].min()), int(data['y'].min()))
+        self.raster_origin = self.origin
+
+    @classmethod
+    def load(cls):
+        """
+        CSV 파일들을 한 번 불러와 지도 캐시를 만드는 함수
+        """
+        data, category_df = load_processed_data()
+        return cls(data, category_df)
+
+    @property
+    def data(self):
+        """
+        병합 스냅샷 (버퍼에 모인 새 칸이 있으면 이때 원래 dtype으로 한 번에 붙임)
+        """
+        if self.pending_rows:
+            new_rows = pd.DataFrame.from_dict(self.pending_rows, orient='index')
+            new_rows = new_rows.reindex(columns=self._data.columns).astype(self._data.dtypes.to_dict())
+            self._data = pd.concat([self._data, new_rows])
+            self.pending_rows = {}
+        return self._data
+
+    def cell_value(self, pos, column):
+        """
+        스냅샷에서 한 칸의 값을 읽는 함수 (버퍼에 있는 새 칸도 포함)
+        """
+        label = self.row_index[pos]
+        if label in self.pending_rows:
+            return self.pending_rows[label][column]
+        return self._data.at[label, column]
+
+    def save(self):
+        """
+        스냅샷을 원본 CSV 형식(area_map.csv, area_struct.csv)으로 저장하는 함수
+        """
+        data = self.data.sort_values(['x', 'y'])
+        for filename, columns in SNAPSHOT_FILES.items():
+            data[columns].to_csv(filename, index=False, encoding='utf-8-sig', lineterminator='\r\n')
+        print(f'delta가 반영된 지도가 {", ".join(SNAPSHOT_FILES)} 파일로 저장되었습니다.')
+
+    def distance_field(self, source):
+        """
+        source에서 출발하는 거리장 (캐시에 없으면 계산)
+        """
+        return self.field_cache.get(source)
+
+    def tile_key(self, pos):
+        """
+        좌표가 속한 렌더링 타일 번호
+        """
+        return ((pos[0] - self.origin[0]) // TILE_SIZE, (pos[1] - self.origin[1]) // TILE_SIZE)
+
+    def cell_color(self, pos):
+        """
+        한 칸을 렌더링할 RGB 색상
+        """
+        if pos not in self.grid_map:
+            return to_rgb(CELL_COLORS['empty'])
+
+        category = self.structures.get(pos)
+        if category is not None:
+            name = self.category_mapping.get(category)
+            return to_rgb(CELL_COLORS.get(name, 'blue'))
+
+        if pos in self.row_index and self.cell_value(pos, 'ConstructionSite') == 1:
+            return to_rgb(CELL_COLORS['ConstructionSite'])
+        return to_rgb(CELL_COLORS['free'])
+
+    def tile(self, key):
+        """
+        렌더링 타일을 반환 (캐시에 없으면 해당 타일 영역만 렌더링)
+
+        Returns:
+            numpy.ndarray: (TILE_SIZE, TILE_SIZE, 3) 모양의 RGB 배열 (행: y, 열: x)
+        """
+        if key not in self.tiles:
+            x0 = self.origin[0] + key[0] * TILE_SIZE
+            y0 = self.origin[1] + key[1] * TILE_SIZE
+            self.tiles[key] = np.array([
+                [self.cell_color((x0 + dx, y0 + dy)) for dx in range(TILE_SIZE)]
+                for dy in range(TILE_SIZE)
+            ])
+        return self.tiles[key]
+
+    def render_raster(self, filename=None):
+        """
+        타일들을 이어 붙여 전체 지도 래스터를 만드는 함수 (바뀌지 않은 타일은 캐시 재사용)
+
+        Args:
+            filename (str): 지정하면 PNG 파일로 저장
+
+        Returns:
+            numpy.ndarray: 전체 지도 RGB 배열 (행: y, 열: x, 좌측 상단 칸 좌표는 raster_origin)
+        """
+        keys = {self.tile_key(pos) for pos in self.grid_map}
+        tx_min = min(key[0] for key in keys)
+        ty_min = min(key[1] for key in keys)
+        self.raster_origin = (self.origin[0] + tx_min * TILE_SIZE, self.origin[1] + ty_min * TILE_SIZE)
+        tx_max = max(key[0] for key in keys)
+        ty_max = max(key[1] for key in keys)
+
+        raster = np.ones(((ty_max - ty_min + 1) * TILE_SIZE, (tx_max - tx_min + 1) * TILE_SIZE, 3))
+        for tx in range(tx_min, tx_max + 1):
+            for ty in range(ty_min, ty_max + 1):
+                row = (ty - ty_min) * TILE_SIZE
+                col = (tx - tx_min) * TILE_SIZE
+                raster[row:row + TILE_SIZE, col:col + TILE_SIZE] = self.tile((tx, ty))
+
+        if filename:
+            plt.imsave(filename, raster)
+            print(f'지도 래스터가 {filename} 파일로 저장되었습니다.')
+
+        return raster
+
+    def apply_delta(self, delta):
+        """
+        바뀐 칸만 담은 delta를 스냅샷, 격자 지도, 구조물 색인에 반영하고
+        바뀐 칸에 닿는 파생 캐시만 무효화하는 함수
+
+        Args:
+            delta (pandas.DataFrame): x, y와 ConstructionSite/category/area 컬럼 (빈 값은 변경 없음, 새 칸은 area 필수)
+
+        Returns:
+            dict: 반영 결과 요약 (바뀐 칸 수, 무효화된 거리장/타일 수)
+        """
+        positions = [(int(x), int(y)) for x, y in zip(delta['x'], delta['y'])]
+        has_area = delta['area'].notna() if 'area' in delta.columns else [False] * len(delta)
+        missing_area = (
+            {pos for pos in positions if pos not in self.row_index}
+            - {pos for pos, area in zip(positions, has_area) if area}
+        )
+        if missing_area:
+            raise ValueError(f'새 칸 {sorted(missing_area)}의 area 값이 delta에 없습니다.')
+
+        changed = set()
+
+        for pos, (_, row) in zip(positions, delta.iterrows()):
+            if pos not in self.row_index:
+                # 지도에 없던 칸은 새 라벨을 붙여 버퍼에 모아 둠 (같은 칸이 여러 번 나오면 누적 반영)
+                self.row_index[pos] = self.next_label
+                self.pending_rows[self.next_label] = {'x': pos[0], 'y': pos[1], **NEW_CELL_DEFAULTS}
+                self.next_label += 1
+
+            label = self.row_index[pos]
+            for column in DELTA_COLUMNS:
+                if column not in delta.columns or pd.isna(row[column]):
+                    continue
+                if label in self.pending_rows:
+                    self.pending_rows[label][column] = int(row[column])
+                else:
+                    self._data.at[label, column] = int(row[column])
+
+            category = self.cell_value(pos, 'category')
+            self.grid_map[pos] = cell_state(self.cell_value(pos, 'ConstructionSite'), category)
+            if pd.notna(category) and category != 0:
+                self.structures[pos] = int(category)
+            else:
+                self.structures.pop(pos, None)
+            changed.add(pos)
+
+        return {
+            'cells': len(changed),
+            'fields': self.invalidate_fields(changed),
+            'tiles': self.invalidate_tiles(changed)
+        }
+
+    def invalidate_fields(self, changed):
+        """
+        바뀐 칸이나 그 이웃 칸에 도달한 거리장만 지우는 함수
+        (도달 영역과 맞닿지 않은 칸의 변화는 BFS 결과에 영향을 주지 않음)
+        """
+        stale = [
+            source for source, field in self.field_cache.fields.items()
+            if any(
+                (x + dx, y + dy) in field
+                for x, y in changed
+                for dx, dy in [(0, 0)] + DIRECTIONS
+            )
+        ]
+        # 지운 거리장으로 만든 경유지 거리 행렬도 함께 지움
+        self.field_cache.discard(stale)
+        return len(stale)
+
+    def invalidate_tiles(self, changed):
+        """
+        바뀐 칸이 속한 렌더링 타일만 지우는 함수
+        """
+        stale = {self.tile_key(pos) for pos in changed} & self.tiles.keys()
+        for key in stale:
+            del self.tiles[key]
+        return len(stale)
+
+
+def load_delta(filename):
+    """
+    변경분 CSV 파일을 불러오는 함수
+
+    Args:
+        filename (str): x, y와 ConstructionSite/category/area 컬럼을 가진 CSV 파일
+
+    Returns:
+        pandas.DataFrame: 변경분 데이터프레임
+    """
+    delta = pd.read_csv(filename)
+    delta.columns = delta.columns.str.strip()
+    return delta
+
+
+def main():
+    """
+    메인 실행 함수
+    """
+    print('반달곰 커피 지도 캐시 및 변경분 반영')
+    print('=' * 50)
+
+    cache = MapCache.load()
+    print(f'격자 지도: {len(cache.grid_map)}개 셀, 구조물: {len(cache.structures)}개')
+
+    # 자주 쓰는 거리장과 타일을 미리 채워 둠
+    for pos, category in cache.structures.items():
+        if cache.category_mapping.get(category) in ['MyHome', 'BandalgomCoffee']:
+            cache.distance_field(pos)
+    cache.render_raster()
+    print(f'캐시된 거리장: {len(cache.field_cache.fields)}개, 타일: {len(cache.tiles)}개')
+
+    if len(sys.argv) < 2:
+        print('사용법: python map_cache.py <delta.csv> (반영 결과를 원본 CSV에 저장)')
+        return
+
+    summary = cache.apply_delta(load_delta(sys.argv[1]))
+    print(f'바뀐 칸: {summary["cells"]}개')
+    print(f'무효화된 거리장: {summary["fields"]}개, 타일: {summary["tiles"]}개')
+    cache.render_raster('map_raster.png')
+    cache.save()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,33 +3,40 @@
 반달곰 커피 프로젝트의 세 번째 단계로 BFS를 이용해 MyHome에서 BandalgomCoffee까지의 최단경로를 찾습니다.
 """
 
+import sys
 import pandas as pd
 from collections import deque
+from contextlib import nullcontext
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from caffee_map import join_area_data, read_area_csvs
+
 # 한글 폰트 경고 방지 - 영어 폰트 사용
 plt.rcParams['font.family'] = 'DejaVu Sans'
 
+# 4방향 이동 (상, 하, 좌, 우)
+DIRECTIONS = [(0, 1), (0, -1), (-1, 0), (1, 0)]
+
 
-def load_processed_data():
+def load_processed_data(join_mode='merge', frames=None):
     """
     전체 데이터를 불러오는 함수 (MyHome 위치 포함)
     
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+        frames (tuple): 이미 불러온 (area_map, area_struct, area_category) (없으면 CSV에서 읽음)
+    
     Returns:
         tuple: (전체 데이터프레임, 카테고리 데이터프레임)
     """
-    # CSV 파일들 불러오기
-    area_map = pd.read_csv('area_map.csv')
-    area_struct = pd.read_csv('area_struct.csv')
-    area_category = pd.read_csv('area_category.csv')
-    
-    # 컬럼명과 데이터의 공백 제거
-    area_category.columns = area_category.columns.str.strip()
-    area_category['struct'] = area_category['struct'].str.strip()
+    # CSV 파일들 불러오기 (공백 제거 포함)
+    if frames is None:
+        frames = read_area_csvs()
+    area_map, area_struct, area_category = frames
     
     # 세 데이터를 하나의 DataFrame으로 병합
-    merged_data = area_map.merge(area_struct, on=['x', 'y'], how='left')
+    merged_data = join_area_data(area_map, area_struct, join_mode)
     
     # Y좌표는 원본 그대로 사용 (1~15 범위)
     
@@ -83,6 +90,26 @@ def find_start_and_end_points(data, category_df):
     return start_point, end_point
 
 
+def cell_state(construction_site, category):
+    """
+    한 칸의 건설현장 여부와 구조물 종류로 격자 상태를 판단하는 함수
+    
+    Args:
+        construction_site: ConstructionSite 값 (1이면 건설현장)
+        category: 구조물 카테고리 값
+        
+    Returns:
+        str: 'obstacle' 또는 'free'
+    """
+    # 건설현장은 장애물
+    if construction_site == 1:
+        return 'obstacle'
+    # Apartment와 Building도 장애물
+    if category in [1, 2]:  # 1: Apartment, 2: Building
+        return 'obstacle'
+    return 'free'
+
+
 def create_grid_map(data, start_point=None):
     """
     BFS를 위한 격자 지도를 생성하는 함수
@@ -98,15 +125,7 @@ def create_grid_map(data, start_point=None):
     
     for _, row in data.iterrows():
         x, y = int(row['x']), int(row['y'])
-        
-        # 건설현장은 장애물
-        if row['ConstructionSite'] == 1:
-            grid_map[(x, y)] = 'obstacle'
-        # Apartment와 Building도 장애물
-        elif row['category'] in [1, 2]:  # 1: Apartment, 2: Building
-            grid_map[(x, y)] = 'obstacle'
-        else:
-            grid_map[(x, y)] = 'free'
+        grid_map[(x, y)] = cell_state(row['ConstructionSite'], row['category'])
     
     # 시작점이 격자 맵에 없다면 추가 (MyHome이 area 1 외부에 있는 경우)
     if start_point and start_point not in grid_map:
@@ -165,6 +184,104 @@ def bfs_shortest_path(grid_map, start, end):
     return []
 
 
+def bfs_distance_field(grid_map, source):
+    """
+    출발점 하나에서 BFS를 한 번 수행해 도달 가능한 모든 칸까지의 거리를 구하는 함수
+
+    Args:
+        grid_map (dict): 격자 지도
+        source (tuple): 출발점 좌표
+
+    Returns:
+        dict: {(x, y): 출발점으로부터의 이동 칸 수} 형태의 거리장
+    """
+    field = {source: 0}
+    queue = deque([source])
+
+    while queue:
+        current_x, current_y = queue.popleft()
+        next_distance = field[(current_x, current_y)] + 1
+
+        for dx, dy in DIRECTIONS:
+            next_pos = (current_x + dx, current_y + dy)
+
+            # 이미 방문했거나 격자 범위를 벗어났거나 장애물인 경우 무시
+            if next_pos in field or grid_map.get(next_pos, 'obstacle') == 'obstacle':
+                continue
+
+            field[next_pos] = next_distance
+            queue.append(next_pos)
+
+    return field
+
+
+class DistanceFieldCache:
+    """
+    하나의 격자 지도에 대해 경유지별 거리장(과 경유지 간 거리 행렬)을 한 번만 계산해 보관하는 캐시
+    """
+
+    def __init__(self, grid_map):
+        self.grid_map = grid_map
+        self.fields = {}
+        # {경유지 좌표 튜플: 거리 행렬} (tour_planner.build_distance_matrix에서 사용)
+        self.matrices = {}
+
+    def get(self, source):
+        """
+        source에서 출발하는 거리장을 반환 (없으면 BFS로 계산 후 저장)
+        """
+        if source not in self.fields:
+            self.fields[source] = bfs_distance_field(self.grid_map, source)
+        return self.fields[source]
+
+    def discard(self, sources):
+        """
+        sources의 거리장과 그 거리장으로 만든 거리 행렬만 지움
+        """
+        sources = set(sources)
+        for source in sources:
+            self.fields.pop(source, None)
+        for stops in [stops for stops in self.matrices if sources.intersection(stops)]:
+            del self.matrices[stops]
+
+    def clear(self):
+        """
+        캐시된 거리장과 거리 행렬을 모두 비움
+        """
+        self.fields.clear()
+        self.matrices.clear()
+
+
+def path_from_distance_field(field, start):
+    """
+    거리장을 따라 내려가며 start에서 거리장의 출발점까지의 최단경로를 복원하는 함수
+
+    Args:
+        field (dict): bfs_distance_field로 구한 거리장
+        start (tuple): 경로를 시작할 좌표 (거리장 안에 있어야 함)
+
+    Returns:
+        list: 최단경로 좌표 리스트 (도달할 수 없으면 빈 리스트)
+    """
+    if start not in field:
+        return []
+
+    path = [start]
+    current_x, current_y = start
+
+    # 거리가 1씩 줄어드는 이웃 칸을 따라가면 출발점에 도착
+    while field[(current_x, current_y)] > 0:
+        target = field[(current_x, current_y)] - 1
+        for dx, dy in DIRECTIONS:
+            next_pos = (current_x + dx, current_y + dy)
+            if field.get(next_pos) == target:
+                break
+        path.append(next_pos)
+        current_x, current_y = next_pos
+
+    return path
+
+
 def visualize_path(data, category_df, path, start, end):
     """
     경로를 시각화하는 함수
@@ -293,6 +410,8 @@ def visualize_path(data, category_df, path, start, end):
         plt.show()
     except:
         pass
+    
+    return fig, ax
 
 
 def save_path_to_csv(path):
@@ -326,24 +445,25 @@ def save_path_to_csv(path):
         print(path_df.tail(3))
 
 
-def main():
+def find_and_save_shortest_path(data, category_df, figure_lock=None):
     """
-    메인 실행 함수
-    """
-    print('반달곰 커피 최단경로 찾기 프로젝트 - 3단계')
-    print('=' * 50)
+    MyHome에서 BandalgomCoffee까지의 최단경로를 찾아 지도(map_final.png)와 CSV(home_to_cafe.csv)로 저장하는 함수
+    (3단계 main과 pipeline.py가 함께 사용)
     
-    # 데이터 불러오기
-    data, category_df = load_processed_data()
-    print(f'불러온 데이터 크기: {data.shape}')
-    print()
+    Args:
+        data (pandas.DataFrame): 전체 데이터
+        category_df (pandas.DataFrame): 카테고리 데이터
+        figure_lock (threading.Lock): 그림을 그리는 동안 잡을 잠금 (없으면 잠금 없이 그림)
     
+    Returns:
+        list: 최단경로 좌표 리스트 (찾지 못하면 빈 리스트)
+    """
     # 시작점과 끝점 찾기
     start_point, end_point = find_start_and_end_points(data, category_df)
     
     if start_point is None or end_point is None:
         print('시작점 또는 끝점을 찾을 수 없어서 경로 탐색을 중단합니다.')
-        return
+        return []
     
     print()
     
@@ -365,16 +485,40 @@ def main():
         print(f'최단 거리: {len(shortest_path) - 1}칸')
         print()
         
-        # 경로 시각화
-        visualize_path(data, category_df, shortest_path, start_point, end_point)
+        # 경로 시각화 (여러 단계가 pyplot을 함께 쓰면 잠금 안에서만 그림)
+        with figure_lock or nullcontext():
+            fig, _ = visualize_path(data, category_df, shortest_path, start_point, end_point)
+            plt.close(fig)
         
         # 경로 CSV로 저장
         save_path_to_csv(shortest_path)
     else:
         print('경로를 찾을 수 없습니다.')
     
+    return shortest_path
+
+
+def main(join_mode='merge'):
+    """
+    메인 실행 함수
+    
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+    """
+    print('반달곰 커피 최단경로 찾기 프로젝트 - 3단계')
+    print('=' * 50)
+    
+    # 데이터 불러오기
+    data, category_df = load_processed_data(join_mode)
+    print(f'불러온 데이터 크기: {data.shape}')
+    print()
+    
+    # 최단경로 탐색 및 저장
+    find_and_save_shortest_path(data, category_df)
+    
     print('3단계 최단경로 탐색 완료!')
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # python map_direct_save.py --dense 로 실행하면 조밀 좌표 병합 사용
+    main('dense' if '--dense' in sys.argv else 'merge')
\ No newline at end of file
@@ -3,32 +3,35 @@
 반달곰 커피 프로젝트의 두 번째 단계로 분석된 데이터를 기반으로 지역 지도를 시각화합니다.
 """
 
-import pandas as pd
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from caffee_map import join_area_data, read_area_csvs
+
 # 한글 폰트 경고 방지 - 영어 폰트 사용
 plt.rcParams['font.family'] = 'DejaVu Sans'
 
 
-def load_processed_data():
+def load_processed_data(join_mode='merge', frames=None):
     """
     1단계에서 처리된 데이터를 다시 불러오는 함수
     
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+        frames (tuple): 이미 불러온 (area_map, area_struct, area_category) (없으면 CSV에서 읽음)
+    
     Returns:
         tuple: (처리된 데이터프레임, 카테고리 데이터프레임)
     """
-    # CSV 파일들 불러오기
-    area_map = pd.read_csv('area_map.csv')
-    area_struct = pd.read_csv('area_struct.csv')
-    area_category = pd.read_csv('area_category.csv')
-    
-    # 컬럼명과 데이터의 공백 제거
-    area_category.columns = area_category.columns.str.strip()
-    area_category['struct'] = area_category['struct'].str.strip()
+    # CSV 파일들 불러오기 (공백 제거 포함)
+    if frames is None:
+        frames = read_area_csvs()
+    area_map, area_struct, area_category = frames
     
     # 세 데이터를 하나의 DataFrame으로 병합
-    merged_data = area_map.merge(area_struct, on=['x', 'y'], how='left')
+    merged_data = join_area_data(area_map, area_struct, join_mode)
     
     # area 1에 대한 데이터만 필터링
     area_1_data = merged_data[merged_data['area'] == 1].copy()
@@ -173,15 +176,18 @@ def create_map_visualization(data, category_df):
     return fig, ax
 
 
-def main():
+def main(join_mode='merge'):
     """
     메인 실행 함수
+    
+    Args:
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
     """
     print('반달곰 커피 지도 시각화 프로젝트 - 2단계')
     print('=' * 50)
     
     # 데이터 불러오기
-    data, category_df = load_processed_data()
+    data, category_df = load_processed_data(join_mode)
     print(f'불러온 데이터 크기: {data.shape}')
     print()
     
@@ -192,4 +198,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # python map_draw.py --dense 로 실행하면 조밀 좌표 병합 사용
+    main('dense' if '--dense' in sys.argv else 'merge')
\ No newline at end of file
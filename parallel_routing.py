@@ -0,0 +1,360 @@
+"""
+멀티코어 병렬 경로 탐색
+격자 지도(와 미리 계산한 거리장)를 multiprocessing.shared_memory에 한 번만 올려 두고,
+경로 질의를 여러 묶음(shard)으로 나눠 프로세스 풀에 보냅니다.
+작업 프로세스는 공유 메모리에 붙기만 하므로 격자를 복사하거나 pickle하지 않으며,
+결과는 질의 순서대로 합쳐집니다. ParallelRouter를 쓰면 여러 질의 묶음이 공유 격자와 프로세스 풀을 재사용합니다.
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from map_direct_save import (
+    bfs_distance_field,
+    create_grid_map,
+    find_start_and_end_points,
+    load_processed_data,
+)
+
+# 공유 격자의 칸 상태 코드
+FREE = 0
+OBSTACLE = 1
+OUTSIDE = 2
+
+# 거리장에서 도달할 수 없는 칸
+UNREACHABLE = -1
+
+# 프로세스 하나당 나눌 shard 개수 (작업량이 고르지 않을 때 부하 분산용)
+SHARDS_PER_PROCESS = 4
+
+# 작업 프로세스가 붙어 있는 공유 메모리 (initializer에서 한 번 설정)
+_worker_state = {}
+
+
+class SharedGrid:
+    """
+    격자 지도와 거리장을 공유 메모리에 올려 두는 객체 (with 문으로 사용하면 끝날 때 해제)
+    """
+
+    def __init__(self, grid_map, fields=None):
+        xs = [pos[0] for pos in grid_map]
+        ys = [pos[1] for pos in grid_map]
+        self.x_min, self.y_min = min(xs), min(ys)
+        self.width = max(xs) - self.x_min + 1
+        self.height = max(ys) - self.y_min + 1
+        size = self.width * self.height
+
+        # 격자: 칸마다 1바이트 상태 코드 (x 우선 순서)
+        self.grid_memory = SharedMemory(create=True, size=size)
+        cells = self.grid_memory.buf
+        cells[:] = bytes([OUTSIDE]) * size
+        for pos, state in grid_map.items():
+            cells[self.index(pos)] = OBSTACLE if state == 'obstacle' else FREE
+
+        # 거리장: 출발점마다 칸 수만큼의 int32 배열을 이어 붙임
+        fields = fields or {}
+        self.field_sources = list(fields)
+        self.field_memory = None
+        if fields:
+            self.field_memory = SharedMemory(create=True, size=4 * size * len(fields))
+            # 모든 바이트를 0xff로 채우면 int32 값이 UNREACHABLE(-1)이 됨
+            self.field_memory.buf[:] = b'\xff' * self.field_memory.size
+            distances = self.field_memory.buf.cast('i')
+            for number, source in enumerate(self.field_sources):
+                offset = number * size
+                for pos, distance in fields[source].items():
+                    distances[offset + self.index(pos)] = distance
+            distances.release()
+
+    def index(self, pos):
+        """
+        좌표를 공유 배열의 선형 인덱스로 변환
+        """
+        return (pos[0] - self.x_min) * self.height + (pos[1] - self.y_min)
+
+    def metadata(self):
+        """
+        작업 프로세스가 공유 메모리에 붙는 데 필요한 정보 (이름과 격자 크기만 전달)
+        """
+        return {
+            'grid_name': self.grid_memory.name,
+            'field_name': self.field_memory.name if self.field_memory else None,
+            'field_sources': self.field_sources,
+            'x_min': self.x_min,
+            'y_min': self.y_min,
+            'width': self.width,
+            'height': self.height
+        }
+
+    def close(self):
+        """
+        공유 메모리를 닫고 삭제
+        """
+        for memory in [self.grid_memory, self.field_memory]:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach(name):
+    """
+    이미 만들어진 공유 메모리에 붙는 함수 (해제는 만든 쪽에서만 하도록 추적 끔)
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12 이하에는 track 인자가 없음
+        return SharedMemory(name=name)
+
+
+def _init_worker(metadata):
+    """
+    프로세스 풀 initializer: 공유 메모리에 한 번만 붙어 두고 이후 질의에서 재사용
+    """
+    grid_memory = _attach(metadata['grid_name'])
+    _worker_state['memories'] = [grid_memory]
+    _worker_state['cells'] = grid_memory.buf
+    _worker_state['distances'] = None
+
+    if metadata['field_name']:
+        field_memory = _attach(metadata['field_name'])
+        _worker_state['memories'].append(field_memory)
+        _worker_state['distances'] = field_memory.buf.cast('i')
+
+    _worker_state['metadata'] = metadata
+
+
+def route_queries(cells, distances, metadata, queries):
+    """
+    공유 격자 위에서 질의 묶음의 최단경로를 구하는 함수
+    목적지(또는 출발점)의 거리장이 공유되어 있으면 탐색 없이 거리장을 따라 내려가고,
+    없으면 bfs_shortest_path와 같은 순서로 BFS를 수행합니다.
+
+    Args:
+        cells (memoryview): 칸 상태 코드 배열
+        distances (memoryview): 거리장 배열 (없으면 None)
+        metadata (dict): SharedGrid.metadata() 정보
+        queries (list): (질의 번호, 시작점, 끝점) 리스트
+
+    Returns:
+        list: (질의 번호, 경로 좌표 리스트) 리스트
+    """
+    x_min, y_min = metadata['x_min'], metadata['y_min']
+    width, height = metadata['width'], metadata['height']
+    size = width * height
+    field_offsets = {
+        tuple(source): number * size
+        for number, source in enumerate(metadata['field_sources'])
+    }
+
+    def to_index(pos):
+        x, y = pos[0] - x_min, pos[1] - y_min
+        if 0 <= x < width and 0 <= y < height:
+            return x * height + y
+        return None
+
+    def to_pos(index):
+        return (index // height + x_min, index % height + y_min)
+
+    def neighbors(index):
+        # 4방향 이동 (상, 하, 좌, 우) - bfs_shortest_path와 같은 순서
+        x, y = divmod(index, height)
+        if y + 1 < height:
+            yield index + 1
+        if y > 0:
+            yield index - 1
+        if x > 0:
+            yield index - height
+        if x + 1 < width:
+            yield index + height
+
+    def descend(offset, index):
+        # 거리가 1씩 줄어드는 이웃 칸을 따라 거리장의 출발점까지 이동
+        if distances[offset + index] == UNREACHABLE:
+            return None
+        path = [index]
+        while distances[offset + index] > 0:
+            target = distances[offset + index] - 1
+            index = next(n for n in neighbors(index) if distances[offset + n] == target)
+            path.append(index)
+        return path
+
+    def bfs(start_index, end_index):
+        parents = {start_index: None}
+        queue = deque([start_index])
+        while queue:
+            current = queue.popleft()
+            if current == end_index:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+            for nxt in neighbors(current):
+                if nxt not in parents and cells[nxt] == FREE:
+                    parents[nxt] = current
+                    queue.append(nxt)
+        return None
+
+    results = []
+    for number, start, end in queries:
+        start_index, end_index = to_index(start), to_index(end)
+        path = None
+
+        if start_index is None or end_index is None or cells[end_index] != FREE:
+            path = [start_index] if start == end and start_index is not None else None
+        elif tuple(end) in field_offsets and cells[start_index] == FREE:
+            path = descend(field_offsets[tuple(end)], start_index)
+        elif tuple(start) in field_offsets and cells[start_index] == FREE:
+            path = descend(field_offsets[tuple(start)], end_index)
+            path = path[::-1] if path else None
+        else:
+            path = bfs(start_index, end_index)
+
+        results.append((number, [to_pos(index) for index in path] if path else []))
+
+    return results
+
+
+def _route_shard(queries):
+    """
+    작업 프로세스에서 질의 묶음 하나를 처리
+    """
+    return route_queries(
+        _worker_state['cells'], _worker_state['distances'], _worker_state['metadata'], queries
+    )
+
+
+def split_into_shards(queries, shard_count):
+    """
+    질의 리스트를 번호를 붙여 비슷한 크기의 연속 묶음으로 나누는 함수
+    """
+    numbered = [(number, start, end) for number, (start, end) in enumerate(queries)]
+    shard_size = max(1, -(-len(numbered) // max(1, shard_count)))
+    return [numbered[i:i + shard_size] for i in range(0, len(numbered), shard_size)]
+
+
+class ParallelRouter:
+    """
+    격자를 공유 메모리에 한 번 올리고 프로세스 풀을 띄워 두는 라우터 (with 문으로 사용하면 끝날 때 해제)
+    같은 지도에 대한 여러 질의 묶음이 공유 격자와 작업 프로세스를 재사용합니다.
+    """
+
+    def __init__(self, grid_map, fields=None, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.shared_grid = SharedGrid(grid_map, fields)
+        try:
+            self.pool = Pool(
+                self.processes, initializer=_init_worker, initargs=(self.shared_grid.metadata(),)
+            )
+        except Exception:
+            self.shared_grid.close()
+            raise
+
+    def route(self, queries):
+        """
+        여러 (시작점, 끝점) 질의의 최단경로를 프로세스 풀로 나눠 구하는 함수
+
+        Args:
+            queries (list): (시작점, 끝점) 좌표 쌍 리스트
+
+        Returns:
+            list: 질의 순서대로의 경로 좌표 리스트들 (경로가 없으면 빈 리스트)
+        """
+        if not queries:
+            return []
+
+        shards = split_into_shards(queries, self.processes * SHARDS_PER_PROCESS)
+        shard_results = self.pool.map(_route_shard, shards)
+
+        # 묶음 순서대로 합치면 질의 순서가 유지됨
+        paths = [None] * len(queries)
+        for shard_result in shard_results:
+            for number, path in shard_result:
+                paths[number] = path
+        return paths
+
+    def close(self):
+        """
+        프로세스 풀을 종료하고 공유 메모리를 해제
+        """
+        self.pool.close()
+        self.pool.join()
+        self.shared_grid.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parallel_route_batch(grid_map, queries, fields=None, processes=None):
+    """
+    질의 묶음 하나를 위한 ParallelRouter 간편 함수 (묶음이 여러 개면 ParallelRouter를 재사용)
+
+    Args:
+        grid_map (dict): 격자 지도
+        queries (list): (시작점, 끝점) 좌표 쌍 리스트
+        fields (dict): 공유할 {출발점: 거리장} (목적지가 겹치는 질의를 탐색 없이 처리)
+        processes (int): 작업 프로세스 수 (없으면 CPU 코어 수)
+
+    Returns:
+        list: 질의 순서대로의 경로 좌표 리스트들 (경로가 없으면 빈 리스트)
+    """
+    if not queries:
+        return []
+
+    with ParallelRouter(grid_map, fields, processes) as router:
+        return router.route(queries)
+
+
+def main():
+    """
+    메인 실행 함수 (python parallel_routing.py [프로세스 수])
+    """
+    print('반달곰 커피 병렬 경로 탐색')
+    print('=' * 50)
+
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    data, category_df = load_processed_data()
+    start_point, end_point = find_start_and_end_points(data, category_df)
+
+    if start_point is None or end_point is None:
+        print('시작점 또는 끝점을 찾을 수 없어서 경로 탐색을 중단합니다.')
+        return
+
+    grid_map = create_grid_map(data, start_point)
+
+    # 모든 빈 칸에서 집까지, 그리고 모든 빈 칸에서 카페까지의 경로 묶음
+    free_cells = sorted(pos for pos, state in grid_map.items() if state == 'free')
+    home_queries = [(pos, start_point) for pos in free_cells]
+    cafe_queries = [(pos, end_point) for pos in free_cells]
+    print(f'질의 개수: {len(home_queries) + len(cafe_queries)}개')
+
+    # 격자와 카페 거리장은 한 번만 공유 메모리에 올리고 두 묶음이 같은 프로세스 풀을 재사용
+    fields = {end_point: bfs_distance_field(grid_map, end_point)}
+    with ParallelRouter(grid_map, fields, processes) as router:
+        started = time.perf_counter()
+        home_paths = router.route(home_queries)
+        print(f'집까지 질의 (BFS): {time.perf_counter() - started:.3f}초')
+
+        started = time.perf_counter()
+        cafe_paths = router.route(cafe_queries)
+        print(f'카페까지 질의 (거리장 공유): {time.perf_counter() - started:.3f}초')
+
+    print(f'도달 가능한 질의: {sum(1 for path in home_paths + cafe_paths if path)}개')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+파이프라인 실행기
+1단계(caffee_map.py), 2단계(map_draw.py), 3단계(map_direct_save.py)를 입력·출력 파일이 선언된 DAG로 보고
+한 프로세스 안에서 CSV를 한 번만 불러와 공유하며 실행합니다.
+세 단계는 모두 원본 CSV만 읽고 서로의 결과를 쓰지 않으므로 선행 단계 없이 병렬로 실행하고,
+입력 파일 내용 해시가 지난 실행(매니페스트 기록)과 같고 출력이 그대로인 단계는 건너뜁니다.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import matplotlib.pyplot as plt
+
+import caffee_map
+import map_direct_save
+import map_draw
+
+# 단계별 입력/출력 해시를 기록하는 매니페스트 파일
+MANIFEST_FILE = '.pipeline_manifest.json'
+
+# 모든 단계가 공통으로 읽는 데이터 파일
+DATA_FILES = ['area_map.csv', 'area_struct.csv', 'area_category.csv']
+
+# 모든 단계의 입력에 포함할 스크립트 (모든 단계가 caffee_map.py의 로더를 사용)
+COMMON_SCRIPTS = ['caffee_map.py']
+
+# pyplot은 전역 상태를 쓰므로 그림 그리기는 한 번에 한 단계씩만 수행
+_pyplot_lock = threading.Lock()
+
+
+class Stage:
+    """
+    선언된 입력/출력 파일과 선행 단계를 가진 파이프라인 단계
+    """
+
+    def __init__(self, name, run, inputs, outputs=(), depends_on=()):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+
+
+class PipelineContext:
+    """
+    단계들이 공유하는 메모리 내 데이터 (CSV는 처음 필요할 때 한 번만 읽음)와 병합 방식
+    """
+
+    def __init__(self, join_mode='merge'):
+        self.join_mode = join_mode
+        self._frames = None
+        self._lock = threading.Lock()
+
+    def frames(self):
+        """
+        (area_map, area_struct, area_category) 데이터프레임 (단계들은 읽기만 함)
+        """
+        with self._lock:
+            if self._frames is None:
+                self._frames = caffee_map.read_area_csvs()
+            return self._frames
+
+
+def run_analysis(context):
+    """
+    1단계: 데이터 분석 및 구조물 요약 통계
+    """
+    data, category_df = caffee_map.load_and_analyze_data(context.join_mode, context.frames())
+    caffee_map.generate_structure_report(data, category_df)
+
+
+def run_drawing(context):
+    """
+    2단계: 지역 지도 시각화 (map.png)
+    """
+    data, category_df = map_draw.load_processed_data(context.join_mode, context.frames())
+    with _pyplot_lock:
+        fig, _ = map_draw.create_map_visualization(data, category_df)
+        plt.close(fig)
+
+
+def run_routing(context):
+    """
+    3단계: 최단경로 탐색 (map_final.png, home_to_cafe.csv)
+    """
+    data, category_df = map_direct_save.load_processed_data(context.join_mode, context.frames())
+    # 경로 탐색은 다른 단계와 병렬로, 그림 그리기만 잠금 안에서 수행
+    map_direct_save.find_and_save_shortest_path(data, category_df, _pyplot_lock)
+
+
+STAGES = [
+    Stage('analyze', run_analysis, DATA_FILES + COMMON_SCRIPTS),
+    Stage('draw', run_drawing, DATA_FILES + COMMON_SCRIPTS + ['map_draw.py'],
+          outputs=['map.png']),
+    Stage('route', run_routing, DATA_FILES + COMMON_SCRIPTS + ['map_direct_save.py'],
+          outputs=['map_final.png', 'home_to_cafe.csv']),
+]
+
+
+def file_hash(path):
+    """
+    파일 내용의 SHA-256 해시 (파일이 없으면 None)
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    """
+    매니페스트 파일을 불러오는 함수 (없거나 깨졌으면 빈 매니페스트)
+    """
+    try:
+        with open(MANIFEST_FILE, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    """
+    매니페스트 파일을 저장하는 함수 (임시 파일에 쓴 뒤 교체)
+    """
+    temp_file = MANIFEST_FILE + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(temp_file, MANIFEST_FILE)
+
+
+def is_up_to_date(stage, manifest):
+    """
+    입력 해시가 기록과 같고 출력 파일이 기록된 그대로 남아 있으면 최신 상태로 판단
+    """
+    record = manifest.get(stage.name)
+    if record is None:
+        return False
+    if record.get('inputs') != {path: file_hash(path) for path in stage.inputs}:
+        return False
+    recorded_outputs = record.get('outputs', {})
+    return all(
+        recorded_outputs.get(path) is not None and recorded_outputs[path] == file_hash(path)
+        for path in stage.outputs
+    )
+
+
+def validate_stages(stages):
+    """
+    선행 단계 이름이 존재하고 순환이 없는지 확인하는 함수
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        for dependency in stage.depends_on:
+            if dependency not in names:
+                raise ValueError(f'{stage.name} 단계의 선행 단계 {dependency}가 없습니다.')
+
+    remaining = {stage.name: set(stage.depends_on) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f'단계 의존성에 순환이 있습니다: {sorted(remaining)}')
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_pipeline(stages=STAGES, force=False, max_workers=None, join_mode='merge'):
+    """
+    DAG 순서대로 단계를 실행하는 함수 (선행 단계가 끝난 단계들은 병렬 실행)
+
+    Args:
+        stages (list): 실행할 Stage 리스트
+        force (bool): True면 최신 상태인 단계도 다시 실행
+        max_workers (int): 동시에 실행할 최대 단계 수
+        join_mode (str): 'merge' (pandas merge) 또는 'dense' (조밀 좌표 병합)
+
+    Returns:
+        dict: {단계 이름: 'ran' 또는 'skipped'}
+    """
+    validate_stages(stages)
+
+    manifest = load_manifest()
+    manifest_lock = threading.Lock()
+    context = PipelineContext(join_mode)
+    results = {}
+
+    def execute(stage):
+        if not force and is_up_to_date(stage, manifest):
+            print(f'[{stage.name}] 변경 없음 - 건너뜀')
+            return 'skipped'
+
+        print(f'[{stage.name}] 실행')
+        # 실행 중에 입력이 바뀌어도 다음 실행에서 다시 돌도록 실행 전 입력 해시를 기록
+        input_hashes = {path: file_hash(path) for path in stage.inputs}
+        stage.run(context)
+        with manifest_lock:
+            manifest[stage.name] = {
+                'inputs': input_hashes,
+                'outputs': {path: file_hash(path) for path in stage.outputs}
+            }
+            save_manifest(manifest)
+        return 'ran'
+
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # 선행 단계가 모두 끝난 단계를 제출
+            for name, stage in list(pending.items()):
+                if all(dependency in results for dependency in stage.depends_on):
+                    running[executor.submit(execute, stage)] = name
+                    del pending[name]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                # 실패한 단계의 예외는 그대로 전달 (매니페스트에 기록되지 않으므로 다음에 다시 실행)
+                results[running.pop(future)] = future.result()
+
+    return results
+
+
+def main():
+    """
+    메인 실행 함수 (python pipeline.py [--force] [--dense])
+    """
+    print('반달곰 커피 파이프라인 실행')
+    print('=' * 50)
+
+    # 화면 표시 없이 파일로만 저장
+    plt.switch_backend('Agg')
+
+    results = run_pipeline(
+        force='--force' in sys.argv,
+        join_mode='dense' if '--dense' in sys.argv else 'merge'
+    )
+
+    print('=' * 50)
+    for name, status in results.items():
+        print(f'{name}: {"실행" if status == "ran" else "건너뜀"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+alternative_routes.py 테스트 (작은 격자에서 모든 단순 경로를 나열한 결과와 비교)
+"""
+
+import random
+
+import pytest
+
+from alternative_routes import k_shortest_paths
+from map_direct_save import DIRECTIONS
+
+
+def all_simple_path_lengths(grid_map, start, end):
+    lengths = []
+
+    def dfs(pos, visited):
+        if pos == end:
+            lengths.append(len(visited))
+            return
+        for dx, dy in DIRECTIONS:
+            next_pos = (pos[0] + dx, pos[1] + dy)
+            if grid_map.get(next_pos) == 'free' and next_pos not in visited:
+                visited.append(next_pos)
+                dfs(next_pos, visited)
+                visited.pop()
+
+    dfs(start, [start])
+    return sorted(lengths)
+
+
+def random_grid(rng, width=4, height=3):
+    grid_map = {
+        (x, y): 'obstacle' if rng.random() < 0.25 else 'free'
+        for x in range(width) for y in range(height)
+    }
+    grid_map[(0, 0)] = grid_map[(width - 1, height - 1)] = 'free'
+    return grid_map, (0, 0), (width - 1, height - 1)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_k_shortest_paths_match_brute_force(seed):
+    grid_map, start, end = random_grid(random.Random(seed))
+    k = 6
+
+    paths = k_shortest_paths(grid_map, start, end, k)
+
+    assert [len(path) for path in paths] == all_simple_path_lengths(grid_map, start, end)[:k]
+    assert len({tuple(path) for path in paths}) == len(paths)
+    for path in paths:
+        assert path[0] == start and path[-1] == end
+        assert len(set(path)) == len(path)
+        assert all(grid_map[pos] == 'free' for pos in path)
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+
+
+def test_k_zero_and_start_equals_end():
+    grid_map = {(x, y): 'free' for x in range(3) for y in range(3)}
+
+    assert k_shortest_paths(grid_map, (0, 0), (2, 2), 0) == []
+    assert k_shortest_paths(grid_map, (1, 1), (1, 1), 3) == [[(1, 1)]]
@@ -0,0 +1,60 @@
+"""
+caffee_map.py 테스트 (조밀 좌표 병합이 pandas merge와 같은 결과를 내는지 확인)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from caffee_map import dense_coordinate_join, merge_area_data
+
+
+def assert_same_as_merge(area_map, area_struct):
+    for sort in [False, True]:
+        pd.testing.assert_frame_equal(
+            dense_coordinate_join(area_map, area_struct, sort),
+            merge_area_data(area_map, area_struct, sort)
+        )
+
+
+@pytest.mark.parametrize('data_dir', ['.', 'dataFile'])
+def test_dense_join_matches_merge_on_shipped_csvs(repo_dir, data_dir):
+    area_map = pd.read_csv(os.path.join(data_dir, 'area_map.csv'))
+    area_struct = pd.read_csv(os.path.join(data_dir, 'area_struct.csv'))
+    assert_same_as_merge(area_map, area_struct)
+
+
+@pytest.fixture
+def shuffled_frames(repo_dir):
+    # 행 순서를 섞고 area_struct 일부 칸을 빼서 누락 칸을 만듦
+    area_map = pd.read_csv('area_map.csv')
+    area_struct = pd.read_csv('area_struct.csv')
+    return area_map.sample(frac=0.9, random_state=1), area_struct.sample(frac=0.7, random_state=2)
+
+
+def test_dense_join_matches_merge_with_missing_cells(shuffled_frames):
+    area_map, area_struct = shuffled_frames
+    area_struct = area_struct.assign(
+        flag=area_struct['category'] > 1,
+        name=area_struct['category'].astype(str),
+        score=area_struct['category'].astype(np.float32),
+        small=area_struct['area'].astype(np.int32)
+    )
+    assert_same_as_merge(area_map, area_struct)
+
+
+@pytest.mark.parametrize('dtype', ['Int64', 'category', 'boolean', 'string'])
+def test_dense_join_matches_merge_with_extension_dtypes(shuffled_frames, dtype):
+    area_map, area_struct = shuffled_frames
+    source = area_struct['category'] > 1 if dtype == 'boolean' else area_struct['category']
+    area_struct = area_struct.assign(extra=source.astype(dtype))
+    assert_same_as_merge(area_map, area_struct)
+
+
+def test_dense_join_matches_merge_with_duplicates(repo_dir):
+    area_map = pd.read_csv('area_map.csv')
+    area_struct = pd.read_csv('area_struct.csv')
+    assert_same_as_merge(area_map, pd.concat([area_struct, area_struct.head(3)]))
+    assert_same_as_merge(pd.concat([area_map.head(3), area_map]), area_struct)
@@ -0,0 +1,55 @@
+"""
+isochrone.py 테스트
+"""
+
+import numpy as np
+
+from isochrone import export_isochrone_raster, isochrone_cells, reached_structures
+from map_cache import MapCache
+
+
+def test_isochrone_cells_stops_at_depth_and_uses_nearest_source():
+    grid_map = {(x, 0): 'free' for x in range(7)}
+    grid_map[(5, 0)] = 'obstacle'
+
+    reached = isochrone_cells(grid_map, [(0, 0), (4, 0)], 1)
+    assert reached == {(0, 0): 0, (1, 0): 1, (4, 0): 0, (3, 0): 1}
+
+    reached = isochrone_cells(grid_map, [(0, 0), (4, 0)], 3)
+    assert reached[(2, 0)] == 2
+    assert (5, 0) not in reached and (6, 0) not in reached
+
+
+def test_reached_structures_counts_obstacles_one_step_further():
+    reached = {(0, 0): 0, (1, 0): 1, (2, 0): 2}
+    structures = {(0, 0): 4, (1, 1): 1, (2, 1): 2, (3, 0): 2, (9, 9): 1}
+    category_mapping = {1: 'Apartment', 2: 'Building', 4: 'BandalgomCoffee'}
+
+    by_category = reached_structures(reached, structures, category_mapping, 2)
+
+    assert by_category == {
+        'BandalgomCoffee': [((0, 0), 0)],
+        'Apartment': [((1, 1), 2)]
+    }
+
+    by_category = reached_structures(reached, structures, category_mapping, 3)
+    assert by_category['Building'] == [((2, 1), 3), ((3, 0), 3)]
+    assert reached_structures(reached, {(0, 0): 7}, category_mapping, 2) == {'Category_7': [((0, 0), 0)]}
+
+
+def test_raster_colors_only_reached_cells(area_data, tmp_path, monkeypatch):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+    reached = {(3, 12): 0, (5, 7): 4}
+
+    monkeypatch.chdir(tmp_path)
+    base = cache.render_raster()
+    raster = export_isochrone_raster(cache, reached, 4)
+
+    origin_x, origin_y = cache.raster_origin
+    changed = {
+        (int(col) + origin_x, int(row) + origin_y)
+        for row, col in zip(*np.nonzero((raster != base).any(axis=2)))
+    }
+    assert changed == set(reached)
+    assert (tmp_path / 'isochrone.png').exists()
@@ -0,0 +1,90 @@
+"""
+map_cache.py 테스트
+"""
+
+import pandas as pd
+import pytest
+
+from map_cache import MapCache
+from map_direct_save import bfs_distance_field, create_grid_map, load_processed_data
+
+
+def test_delta_after_new_cell_patches_right_row_without_range_index(area_data):
+    data, category_df = area_data
+    cache = MapCache(data[data['area'] == 1].copy(), category_df)
+
+    cache.apply_delta(pd.DataFrame({'x': [20], 'y': [20], 'category': [4], 'area': [1]}))
+    cache.apply_delta(pd.DataFrame({'x': [2], 'y': [12], 'ConstructionSite': [1]}))
+
+    patched = cache.data[cache.data['ConstructionSite'] == 1]
+    assert (2, 12) in set(zip(patched['x'], patched['y']))
+    assert cache.data.index.is_unique
+    for pos, label in cache.row_index.items():
+        assert (cache.data.at[label, 'x'], cache.data.at[label, 'y']) == pos
+    assert cache.grid_map == create_grid_map(cache.data)
+
+
+def test_new_cell_listed_twice_is_added_once(area_data):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+
+    cache.apply_delta(pd.DataFrame({
+        'x': [16, 16],
+        'y': [1, 1],
+        'ConstructionSite': [0, 1],
+        'category': [2, None],
+        'area': [1, None]
+    }))
+
+    added = cache.data[(cache.data['x'] == 16) & (cache.data['y'] == 1)]
+    assert len(added) == 1
+    assert added.iloc[0]['ConstructionSite'] == 1
+    assert added.iloc[0]['category'] == 2
+
+
+def test_delta_invalidates_only_touched_distance_fields(area_data):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+    cache.distance_field((14, 2))
+
+    summary = cache.apply_delta(pd.DataFrame({'x': [3], 'y': [12], 'ConstructionSite': [1]}))
+
+    assert summary['fields'] == 1
+    assert cache.distance_field((14, 2)) == bfs_distance_field(create_grid_map(cache.data), (14, 2))
+
+
+def test_new_cell_keeps_dtypes_and_area_filter(area_data):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+    dtypes = cache.data.dtypes
+
+    cache.apply_delta(pd.DataFrame({'x': [16], 'y': [1], 'area': [1]}))
+    cache.apply_delta(pd.DataFrame({'x': [16], 'y': [2], 'area': [1], 'ConstructionSite': [1]}))
+
+    # 새 칸은 스냅샷을 읽을 때까지 버퍼에만 쌓임
+    assert len(cache.pending_rows) == 2
+    pd.testing.assert_series_equal(cache.data.dtypes, dtypes)
+    area_1 = cache.data[cache.data['area'] == 1]
+    assert {(16, 1), (16, 2)} <= set(zip(area_1['x'], area_1['y']))
+
+
+def test_new_cell_without_area_is_rejected(area_data):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+
+    with pytest.raises(ValueError):
+        cache.apply_delta(pd.DataFrame({'x': [16], 'y': [1], 'category': [4]}))
+    assert (16, 1) not in cache.grid_map
+
+
+def test_saved_snapshot_is_read_back_by_the_loaders(area_data, tmp_path, monkeypatch):
+    data, category_df = area_data
+    cache = MapCache(data, category_df)
+    cache.apply_delta(pd.DataFrame({'x': [3, 16], 'y': [12, 1], 'ConstructionSite': [1, 0], 'area': [None, 2]}))
+
+    monkeypatch.chdir(tmp_path)
+    category_df.to_csv('area_category.csv', index=False)
+    cache.save()
+    reloaded, _ = load_processed_data()
+
+    assert create_grid_map(reloaded) == cache.grid_map
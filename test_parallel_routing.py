@@ -0,0 +1,49 @@
+"""
+parallel_routing.py 테스트 (bfs_shortest_path와 같은 경로를 내는지 확인)
+"""
+
+import random
+
+import pytest
+
+from map_direct_save import bfs_distance_field, bfs_shortest_path
+from parallel_routing import ParallelRouter, parallel_route_batch
+
+
+@pytest.fixture
+def random_grid():
+    rng = random.Random(0)
+    grid_map = {
+        (x, y): 'obstacle' if rng.random() < 0.3 else 'free'
+        for x in range(1, 41) for y in range(1, 41)
+    }
+    free_cells = sorted(pos for pos, state in grid_map.items() if state == 'free')
+    ends = rng.sample(free_cells, 5)
+    queries = [(rng.choice(free_cells), rng.choice(ends)) for _ in range(200)]
+    # 장애물 끝점과 지도 밖 끝점 질의도 섞음
+    queries += [(free_cells[0], (1, 1)), (free_cells[0], (0, 0)), (free_cells[0], free_cells[0])]
+    return grid_map, ends, queries
+
+
+def test_parallel_paths_match_bfs_without_fields(random_grid):
+    grid_map, _, queries = random_grid
+
+    paths = parallel_route_batch(grid_map, queries, processes=2)
+
+    assert paths == [bfs_shortest_path(grid_map, start, end) for start, end in queries]
+
+
+def test_parallel_paths_match_bfs_with_shared_fields(random_grid):
+    grid_map, ends, queries = random_grid
+    fields = {end: bfs_distance_field(grid_map, end) for end in ends}
+
+    with ParallelRouter(grid_map, fields, processes=2) as router:
+        # 같은 라우터로 두 묶음을 처리해도 결과가 같아야 함
+        for batch in [queries[:100], queries[100:]]:
+            paths = router.route(batch)
+            for path, (start, end) in zip(paths, batch):
+                expected = bfs_shortest_path(grid_map, start, end)
+                assert len(path) == len(expected)
+                assert path[:1] == expected[:1] and path[-1:] == expected[-1:]
+                assert all(grid_map[pos] == 'free' for pos in path)
+                assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
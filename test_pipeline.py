@@ -0,0 +1,78 @@
+"""
+pipeline.py 테스트 (매니페스트에 따른 건너뛰기/재실행과 단계 의존성 검사)
+"""
+
+import pytest
+
+from pipeline import Stage, load_manifest, run_pipeline, validate_stages
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # 매니페스트와 입력/출력 파일은 현재 디렉터리 기준 상대 경로
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input.txt').write_text('1')
+    return tmp_path
+
+
+def make_stage(name, calls, depends_on=()):
+    def run(context):
+        calls.append(name)
+        with open('input.txt') as source, open(f'{name}.out', 'w') as file:
+            file.write(source.read())
+    return Stage(name, run, ['input.txt'], outputs=[f'{name}.out'], depends_on=depends_on)
+
+
+def test_unchanged_stages_are_skipped_and_changed_inputs_rerun(workdir):
+    calls = []
+    stages = [make_stage('a', calls), make_stage('b', calls)]
+
+    assert run_pipeline(stages) == {'a': 'ran', 'b': 'ran'}
+    assert set(load_manifest()) == {'a', 'b'}
+    assert run_pipeline(stages) == {'a': 'skipped', 'b': 'skipped'}
+
+    (workdir / 'input.txt').write_text('2')
+    assert run_pipeline(stages) == {'a': 'ran', 'b': 'ran'}
+    assert len(calls) == 4
+
+
+def test_changed_or_missing_output_reruns_only_that_stage(workdir):
+    calls = []
+    stages = [make_stage('a', calls), make_stage('b', calls)]
+    run_pipeline(stages)
+
+    (workdir / 'a.out').write_text('edited')
+    assert run_pipeline(stages) == {'a': 'ran', 'b': 'skipped'}
+
+    (workdir / 'b.out').unlink()
+    assert run_pipeline(stages) == {'a': 'skipped', 'b': 'ran'}
+    assert run_pipeline(stages, force=True) == {'a': 'ran', 'b': 'ran'}
+
+
+def test_failed_stage_is_not_recorded(workdir):
+    def fail(context):
+        raise RuntimeError('실패')
+
+    with pytest.raises(RuntimeError):
+        run_pipeline([Stage('broken', fail, ['input.txt'])])
+    assert 'broken' not in load_manifest()
+
+
+def test_dependent_stage_runs_after_its_dependency(workdir):
+    calls = []
+    stages = [make_stage('late', calls, depends_on=['early']), make_stage('early', calls)]
+
+    run_pipeline(stages)
+
+    assert calls == ['early', 'late']
+
+
+def test_validate_stages_rejects_cycles_and_unknown_dependencies():
+    def noop(context):
+        pass
+
+    with pytest.raises(ValueError):
+        validate_stages([Stage('a', noop, [], depends_on=['b']), Stage('b', noop, [], depends_on=['a'])])
+    with pytest.raises(ValueError):
+        validate_stages([Stage('a', noop, [], depends_on=['missing'])])
+    validate_stages([Stage('a', noop, []), Stage('b', noop, [], depends_on=['a'])])
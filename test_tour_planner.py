@@ -0,0 +1,82 @@
+"""
+tour_planner.py 테스트
+"""
+
+import itertools
+
+import pytest
+
+from map_direct_save import (
+    DistanceFieldCache,
+    create_grid_map,
+    find_start_and_end_points,
+)
+from tour_planner import (
+    build_distance_matrix,
+    check_route,
+    held_karp_order,
+    plan_tour,
+    tour_length,
+)
+
+
+def test_tour_on_real_data_does_not_cross_obstacles(area_data):
+    data, category_df = area_data
+    start, _ = find_start_and_end_points(data, category_df)
+    grid_map = create_grid_map(data, start)
+    structures = data[data['category'] != 0]
+    stops = [(int(x), int(y)) for x, y in zip(structures['x'], structures['y'])]
+
+    order, route, total = plan_tour(grid_map, start, stops)
+
+    check_route(grid_map, route, order)
+    assert len(route) - 1 == total
+    for a, b in zip(route, route[1:]):
+        assert grid_map[a] == 'free' or grid_map[b] == 'free'
+
+
+def test_adjacent_obstacle_stops_are_not_one_step_apart():
+    # 장애물 두 개가 붙어 있어도 빈 칸을 돌아서 가야 함
+    grid_map = {(x, y): 'free' for x in range(3) for y in range(2)}
+    grid_map[(1, 0)] = 'obstacle'
+    grid_map[(2, 0)] = 'obstacle'
+
+    order, route, total = plan_tour(grid_map, (0, 0), [(1, 0), (2, 0)])
+
+    assert order == [(0, 0), (1, 0), (2, 0)]
+    assert total == 4
+    assert route == [(0, 0), (1, 0), (1, 1), (2, 1), (2, 0)]
+
+
+def test_check_route_rejects_wall_crossing():
+    grid_map = {(0, 0): 'obstacle', (1, 0): 'obstacle', (0, 1): 'free'}
+    with pytest.raises(ValueError):
+        check_route(grid_map, [(0, 0), (1, 0)], [(0, 0), (1, 0)])
+
+
+def test_held_karp_matches_brute_force():
+    grid_map = {(x, y): 'free' for x in range(6) for y in range(6)}
+    for pos in [(1, 1), (1, 2), (1, 3), (3, 2), (3, 3), (3, 4), (4, 4)]:
+        grid_map[pos] = 'obstacle'
+    points = [(0, 0), (5, 5), (2, 2), (4, 0), (0, 5), (3, 3), (5, 2)]
+
+    matrix = build_distance_matrix(points, DistanceFieldCache(grid_map))
+    best = min(
+        tour_length([0] + list(order), matrix)
+        for order in itertools.permutations(range(1, len(points)))
+    )
+
+    assert tour_length(held_karp_order(matrix), matrix) == best
+
+
+def test_distance_matrix_is_cached_per_stop_list():
+    grid_map = {(x, y): 'free' for x in range(4) for y in range(4)}
+    field_cache = DistanceFieldCache(grid_map)
+    points = [(0, 0), (3, 3), (0, 3)]
+
+    matrix = build_distance_matrix(points, field_cache)
+
+    assert build_distance_matrix(points, field_cache) is matrix
+    field_cache.discard([(3, 3)])
+    assert tuple(points) not in field_cache.matrices
+    assert build_distance_matrix(points, field_cache) == matrix
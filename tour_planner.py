@@ -0,0 +1,322 @@
+"""
+4단계: 다중 경유지 경로 계획
+반달곰 커피 프로젝트의 네 번째 단계로 MyHome에서 출발해 여러 구조물을 가장 짧게 방문하는 순서를 찾습니다.
+경유지마다 거리장을 한 번만 계산해 캐시하고, 경유지 수가 적으면 Held-Karp DP로 정확한 해를,
+많으면 최근접 이웃 + 2-opt 휴리스틱으로 근사해를 구합니다.
+"""
+
+import math
+
+import pandas as pd
+
+from map_direct_save import (
+    DIRECTIONS,
+    DistanceFieldCache,
+    create_grid_map,
+    find_start_and_end_points,
+    load_processed_data,
+    path_from_distance_field,
+)
+
+# Held-Karp DP로 정확히 풀 최대 경유지 수 (출발점 포함), 넘으면 휴리스틱 사용
+EXACT_STOP_LIMIT = 12
+
+
+def free_neighbors(grid_map, field, pos):
+    """
+    pos의 이웃 중 거리장에 있는 빈 칸 리스트
+    (장애물인 거리장 출발점은 제외해야 장애물끼리 붙어 있어도 벽을 통과하지 않음)
+    """
+    return [
+        (pos[0] + dx, pos[1] + dy)
+        for dx, dy in DIRECTIONS
+        if (pos[0] + dx, pos[1] + dy) in field
+        and grid_map.get((pos[0] + dx, pos[1] + dy)) == 'free'
+    ]
+
+
+def stop_distance(field, stop, grid_map):
+    """
+    거리장에서 경유지까지의 거리를 구하는 함수
+    경유지가 장애물(Apartment, Building 등)이면 인접한 빈 칸을 통해서만 들어갑니다.
+
+    Args:
+        field (dict): 거리장
+        stop (tuple): 경유지 좌표
+        grid_map (dict): 격자 지도
+
+    Returns:
+        float: 이동 칸 수 (도달할 수 없으면 math.inf)
+    """
+    if stop in field:
+        return field[stop]
+
+    neighbor_distances = [field[pos] for pos in free_neighbors(grid_map, field, stop)]
+    if not neighbor_distances:
+        return math.inf
+    return min(neighbor_distances) + 1
+
+
+def build_distance_matrix(stops, field_cache):
+    """
+    경유지 간 최단거리 행렬을 만드는 함수 (경유지마다 거리장 1개만 사용)
+    같은 경유지 목록의 행렬은 field_cache에 저장해 두고 다시 계산하지 않습니다.
+
+    Args:
+        stops (list): 경유지 좌표 리스트
+        field_cache (DistanceFieldCache): 거리장 캐시
+
+    Returns:
+        list: matrix[i][j] = stops[i]에서 stops[j]까지의 이동 칸 수
+    """
+    key = tuple(stops)
+    if key not in field_cache.matrices:
+        fields = [field_cache.get(stop) for stop in stops]
+        field_cache.matrices[key] = [
+            [0 if i == j else stop_distance(fields[j], stops[i], field_cache.grid_map) for j in range(len(stops))]
+            for i in range(len(stops))
+        ]
+    return field_cache.matrices[key]
+
+
+def tour_length(order, matrix):
+    """
+    방문 순서의 전체 이동 칸 수를 계산하는 함수
+    """
+    return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+
+def held_karp_order(matrix):
+    """
+    Held-Karp DP로 0번 경유지에서 출발해 모든 경유지를 방문하는 최적 순서를 구하는 함수
+
+    Args:
+        matrix (list): 경유지 간 거리 행렬
+
+    Returns:
+        list: 경유지 인덱스의 방문 순서 (0번으로 시작)
+    """
+    n = len(matrix)
+    if n <= 2:
+        return list(range(n))
+
+    # cost[mask][j]: 0번에서 출발해 mask의 경유지를 모두 방문하고 j에서 끝나는 최소 비용
+    full = 1 << n
+    cost = [[math.inf] * n for _ in range(full)]
+    parent = [[-1] * n for _ in range(full)]
+    cost[1][0] = 0
+
+    for mask in range(1, full, 2):
+        for last in range(n):
+            current = cost[mask][last]
+            if current == math.inf:
+                continue
+            for nxt in range(1, n):
+                if mask & (1 << nxt):
+                    continue
+                next_mask = mask | (1 << nxt)
+                candidate = current + matrix[last][nxt]
+                if candidate < cost[next_mask][nxt]:
+                    cost[next_mask][nxt] = candidate
+                    parent[next_mask][nxt] = last
+
+    mask = full - 1
+    last = min(range(n), key=lambda j: cost[mask][j])
+    order = []
+    while last != -1:
+        order.append(last)
+        mask, last = mask ^ (1 << last), parent[mask][last]
+
+    return order[::-1]
+
+
+def nearest_neighbor_order(matrix):
+    """
+    최근접 이웃 방식으로 0번 경유지에서 출발하는 방문 순서를 구하는 함수
+    """
+    remaining = set(range(1, len(matrix)))
+    order = [0]
+    while remaining:
+        last = order[-1]
+        nxt = min(remaining, key=lambda j: (matrix[last][j], j))
+        order.append(nxt)
+        remaining.remove(nxt)
+    return order
+
+
+def two_opt(order, matrix):
+    """
+    2-opt로 방문 순서를 개선하는 함수 (출발점은 고정, 끝점은 열린 경로)
+
+    Args:
+        order (list): 초기 방문 순서
+        matrix (list): 경유지 간 거리 행렬
+
+    Returns:
+        list: 개선된 방문 순서
+    """
+    order = list(order)
+    improved = True
+
+    while improved:
+        improved = False
+        for i in range(1, len(order) - 1):
+            for k in range(i + 1, len(order)):
+                # order[i..k] 구간을 뒤집을 때 바뀌는 간선만 비교
+                before = matrix[order[i - 1]][order[i]]
+                after = matrix[order[i - 1]][order[k]]
+                if k + 1 < len(order):
+                    before += matrix[order[k]][order[k + 1]]
+                    after += matrix[order[i]][order[k + 1]]
+                if after < before:
+                    order[i:k + 1] = reversed(order[i:k + 1])
+                    improved = True
+
+    return order
+
+
+def plan_tour(grid_map, start, stops, field_cache=None, exact_limit=EXACT_STOP_LIMIT):
+    """
+    start에서 출발해 stops를 모두 방문하는 순서와 실제 경로를 구하는 함수
+
+    Args:
+        grid_map (dict): 격자 지도
+        start (tuple): 출발점 좌표
+        stops (list): 방문할 구조물 좌표 리스트
+        field_cache (DistanceFieldCache): 재사용할 거리장 캐시 (없으면 새로 생성)
+        exact_limit (int): Held-Karp DP를 사용할 최대 경유지 수 (출발점 포함)
+
+    Returns:
+        tuple: (방문 순서 좌표 리스트, 전체 경로 좌표 리스트, 전체 이동 칸 수)
+    """
+    if field_cache is None:
+        field_cache = DistanceFieldCache(grid_map)
+
+    points = [start] + [stop for stop in dict.fromkeys(stops) if stop != start]
+
+    # 출발점에서 도달할 수 없는 경유지는 제외 (격자가 무향이므로 나머지끼리는 서로 도달 가능)
+    start_field = field_cache.get(start)
+    unreachable = [
+        stop for stop in points[1:]
+        if stop_distance(start_field, stop, grid_map) == math.inf
+    ]
+    if unreachable:
+        print(f'도달할 수 없는 경유지 {len(unreachable)}개를 제외합니다: {unreachable}')
+        points = [point for point in points if point not in unreachable]
+
+    matrix = build_distance_matrix(points, field_cache)
+
+    if len(points) <= exact_limit:
+        order = held_karp_order(matrix)
+    else:
+        order = two_opt(nearest_neighbor_order(matrix), matrix)
+
+    total = tour_length(order, matrix)
+    route = [points[order[0]]]
+    for a, b in zip(order, order[1:]):
+        route.extend(leg_path(points[a], points[b], field_cache)[1:])
+
+    check_route(grid_map, route, points)
+    return [points[i] for i in order], route, total
+
+
+def check_route(grid_map, route, stops):
+    """
+    경로가 한 칸씩 이동하고 벽을 통과하지 않는지 확인하는 함수 (어긋나면 ValueError)
+    장애물 칸은 경유지 자신일 때만 허용하고, 장애물 칸 두 개가 연속으로 이어질 수 없습니다.
+    """
+    stops = set(stops)
+    for pos in route:
+        if grid_map.get(pos) != 'free' and pos not in stops:
+            raise ValueError(f'경로가 장애물 {pos}을 지나갑니다.')
+
+    for a, b in zip(route, route[1:]):
+        if abs(a[0] - b[0]) + abs(a[1] - b[1]) != 1:
+            raise ValueError(f'경로가 {a}에서 {b}로 건너뜁니다.')
+        if grid_map.get(a) != 'free' and grid_map.get(b) != 'free':
+            raise ValueError(f'경로가 장애물 {a}에서 장애물 {b}로 바로 이동합니다.')
+
+
+def leg_path(origin, destination, field_cache):
+    """
+    캐시된 destination 거리장을 따라 origin에서 destination까지의 경로를 복원하는 함수
+    """
+    field = field_cache.get(destination)
+    if origin in field:
+        return path_from_distance_field(field, origin)
+
+    # 장애물 경유지에서 출발하는 경우 가장 가까운 인접 빈 칸을 거쳐 나감
+    neighbors = free_neighbors(field_cache.grid_map, field, origin)
+    if not neighbors:
+        return []
+    exit_cell = min(neighbors, key=lambda pos: field[pos])
+    return [origin] + path_from_distance_field(field, exit_cell)
+
+
+def save_tour_to_csv(order, route, filename='tour_route.csv'):
+    """
+    다중 경유지 경로를 CSV 파일로 저장하는 함수
+
+    Args:
+        order (list): 방문 순서 좌표 리스트
+        route (list): 전체 경로 좌표 리스트
+        filename (str): 저장할 파일명
+    """
+    if not route:
+        print('저장할 경로가 없습니다.')
+        return
+
+    stop_numbers = {stop: number for number, stop in enumerate(order)}
+    route_df = pd.DataFrame({
+        'step': range(1, len(route) + 1),
+        'x': [point[0] for point in route],
+        'y': [point[1] for point in route],
+        'stop': [stop_numbers.get(point, '') for point in route]
+    })
+    route_df.to_csv(filename, index=False)
+    print(f'경로가 {filename} 파일로 저장되었습니다. (총 {len(route)}단계)')
+
+
+def main():
+    """
+    메인 실행 함수
+    """
+    print('반달곰 커피 다중 경유지 경로 계획 프로젝트 - 4단계')
+    print('=' * 50)
+
+    # 데이터 불러오기
+    data, category_df = load_processed_data()
+    start_point, _ = find_start_and_end_points(data, category_df)
+
+    if start_point is None:
+        print('시작점을 찾을 수 없어서 경로 계획을 중단합니다.')
+        return
+
+    grid_map = create_grid_map(data, start_point)
+
+    # 모든 구조물을 경유지로 사용
+    category_mapping = category_df.set_index('category')['struct'].to_dict()
+    structures = data[data['category'] != 0].sort_values(['x', 'y'])
+    stops = [(int(row['x']), int(row['y'])) for _, row in structures.iterrows()]
+    print(f'경유지 개수: {len(stops)}개')
+
+    # 거리장 캐시를 공유하므로 같은 지도에서 다시 계획해도 BFS를 반복하지 않음
+    field_cache = DistanceFieldCache(grid_map)
+    order, route, total = plan_tour(grid_map, start_point, stops, field_cache)
+
+    print(f'계산한 거리장 개수: {len(field_cache.fields)}개')
+    print('방문 순서:')
+    labels = structures.set_index(['x', 'y'])['category'].to_dict()
+    for number, stop in enumerate(order):
+        name = category_mapping.get(labels.get(stop), 'Start')
+        print(f'{number}: {name} {stop}')
+
+    if route:
+        print(f'전체 이동 거리: {total}칸')
+        save_tour_to_csv(order, route)
+
+    print('4단계 다중 경유지 경로 계획 완료!')
+
+
+if __name__ == '__main__':
+    main()